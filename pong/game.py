@@ -11,11 +11,8 @@ from collections import namedtuple
 import pygame
 from pygame import locals as consts
 
-from pong.geometry import Corners
 from pong.geometry import Point
 from pong.geometry import Rect
-from pong.geometry import Segment
-from pong.geometry import Sides
 from pong.geometry import Vector
 
 
@@ -31,6 +28,9 @@ FRAMES_PER_SECOND = 60
 BACKGROUND_COLOR = Color(r=0, g=0, b=0)
 SCREEN_HEIGHT = 1000
 SCREEN_WIDTH = 1600
+SCREEN_CENTER_X = SCREEN_WIDTH // 2
+SCREEN_CENTER_Y = SCREEN_HEIGHT // 2
+SCREEN_RECT = Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
 
 # Ball constants
 BALL_START_ANGLE = 48
@@ -59,6 +59,23 @@ SAUCE_MULTIPLIER = 30
 SAUCE_MAX = SAUCE_MULTIPLIER // 2
 SAUCE_MIN = -SAUCE_MAX
 
+# Screen edge bits, packed as top | right | bottom | left
+EDGE_TOP = 0b0001
+EDGE_RIGHT = 0b0010
+EDGE_BOTTOM = 0b0100
+EDGE_LEFT = 0b1000
+
+# (reflect horizontally, reflect vertically) for every edge combination
+EDGE_REFLECTIONS = tuple(
+    (bool(edges & (EDGE_LEFT | EDGE_RIGHT)),
+     bool(edges & (EDGE_TOP | EDGE_BOTTOM)))
+    for edges in range(16)
+)
+
+# Ye olde lookup tables. tan of every whole degree, for the AI's
+# trajectory projections
+TANGENTS = tuple(math.tan(math.radians(angle)) for angle in range(360))
+
 # Action constants
 PADDLE_UP = 'PADDLE_UP'
 PADDLE_DOWN = 'PADDLE_DOWN'
@@ -83,6 +100,8 @@ MENU_OPTIONS = OrderedDict([
 
 class Player(object):
 
+    __slots__ = ('key_map', 'paddle', 'actions', 'is_human', 'bindings')
+
     def __init__(self, key_map, paddle):
         self.key_map = key_map
         self.paddle = paddle
@@ -91,11 +110,17 @@ class Player(object):
             PADDLE_DOWN: self.paddle.down,
         }
         self.is_human = True
+        # resolve key -> handler once rather than on every frame
+        self.bindings = [
+            (key, self.actions[action])
+            for key, action in self.key_map.items()
+            if action in self.actions
+        ]
 
     def dispatch(self, keys_pressed):
-        for key, action in self.key_map.items():
+        for key, handler in self.bindings:
             if keys_pressed[key]:
-                self.actions.get(action, lambda: None)()
+                handler()
 
 
 class Path(object):
@@ -111,7 +136,9 @@ class Path(object):
         self.points.append(point)
 
     def clear(self):
-        self.points = []
+        # the AI clears its prediction every frame; reuse the list
+        # rather than churning out a new one each time
+        del self.points[:]
 
     def draw(self, screen):
         pygame.draw.lines(screen, self.color, False, self.points, 3)
@@ -119,65 +146,107 @@ class Path(object):
 
 class Ball(object):
 
+    __slots__ = ('rect', 'vector')
+
     def __init__(self):
-        left = SCREEN_WIDTH // 2 - (BALL_WIDTH // 2)
-        top = SCREEN_HEIGHT // 2 - (BALL_HEIGHT // 2)
+        left = SCREEN_CENTER_X - (BALL_WIDTH // 2)
+        top = SCREEN_CENTER_Y - (BALL_HEIGHT // 2)
         self.rect = Rect(left, top, BALL_WIDTH, BALL_HEIGHT, BALL_COLOR)
         self.vector = Vector(BALL_START_ANGLE, BALL_MIN_SPEED)
-        self.sauce = 0
 
     def handle_screen_edges(self, screen_rect):
-        uncontained = self.rect.get_uncontained_edges(screen_rect)
-        reflect_h = uncontained.left or uncontained.right
-        reflect_v = uncontained.top or uncontained.bottom
-        if uncontained.bottom:
-            self.rect.bottom = SCREEN_HEIGHT - 1
-        elif uncontained.top:
-            self.rect.top = 1
+        # same test as Rect.get_uncontained_edges, but packed into an
+        # int so we don't build a Sides for the common nothing-hit case
+        rect = self.rect
+        edges = (
+            (rect.top <= screen_rect.top) * EDGE_TOP |
+            (rect.right >= screen_rect.right) * EDGE_RIGHT |
+            (rect.bottom >= screen_rect.bottom) * EDGE_BOTTOM |
+            (rect.left <= screen_rect.left) * EDGE_LEFT
+        )
+        if not edges:
+            # mid-field, which is most frames
+            return
+        reflect_h, reflect_v = EDGE_REFLECTIONS[edges]
+        if edges & EDGE_BOTTOM:
+            rect.bottom = SCREEN_HEIGHT - 1
+        elif edges & EDGE_TOP:
+            rect.top = 1
         self.vector = self.vector.reflect(reflect_h, reflect_v)
 
+    def handle_paddle_collisions(self, paddles):
+        # the paddles are at opposite ends of the screen, so we can hit
+        # one of them at most each frame
+        for paddle in paddles:
+            if self.handle_paddle_collision(paddle):
+                return
+
     def handle_paddle_collision(self, paddle):
-        going_left = 90 < self.vector.angle < 270
-        going_up = 0 < self.vector.angle < 180
-        ball_y = self.rect.center.y
-        paddle_sides = paddle.rect.segments
-        delta = self.vector.cartesian
-        ball_corners = Corners(*[
-            Segment(
-                corner,
-                Point(corner.x + delta.x, corner.y + delta.y))
-            for corner in self.rect.corners
-        ])
-        hits = Sides(*[
-            next(
-                filter(
-                    lambda c: c,
-                    [corner.intersection(side) for corner in ball_corners]
-                ), None
-            )
-            for side in paddle_sides
-        ])
-        if any(hits):
+        dx, dy = self.vector.cartesian
+        # broad phase: if the box the ball sweeps across this frame
+        # misses the paddle there's nothing to sweep. The paddles sit at
+        # opposite ends of the screen so that's the case for at least
+        # one of them every frame, and the vertical check catches the
+        # ball passing above or below a paddle
+        # (edges are worked out inline; the right/bottom properties
+        # would cost a call each, every frame, for both paddles)
+        rect, paddle_rect = self.rect, paddle.rect
+        swept_left = rect.left
+        swept_right = swept_left + rect.width
+        if dx < 0:
+            swept_left += dx
+        else:
+            swept_right += dx
+        paddle_left = paddle_rect.left
+        if (swept_left > paddle_left + paddle_rect.width or
+                swept_right < paddle_left):
+            return False
+        swept_top = rect.top
+        swept_bottom = swept_top + rect.height
+        if dy < 0:
+            swept_top += dy
+        else:
+            swept_bottom += dy
+        paddle_top = paddle_rect.top
+        if (swept_top > paddle_top + paddle_rect.height or
+                swept_bottom < paddle_top):
+            return False
+
+        hit = rect.sweep(paddle_rect, dx, dy)
+        if hit is not None:
+            t, side = hit
+            going_up = 0 < self.vector.angle < 180
+            ball_y = self.rect.center.y
             self.vector = self.vector.reflect(horizontally=True)
-            if going_left and hits.right:
-                self.rect.left = hits.right.x + 1
-                self.rect.top = hits.right.y
-            elif not going_left and hits.left:
-                self.rect.right = hits.left.x - 1
-                self.rect.top = hits.left.y
-
-            if hits.bottom and going_up:
-                self.rect.top = hits.bottom.y
-                self.vector = self.vector.reflect(vertically=True)
-            elif hits.top and not going_up:
-                self.rect.bottom = hits.top.y
-                self.vector = self.vector.reflect(vertically=True)
+            if side == 'right':
+                self.rect.left = paddle.rect.right + 1
+                self.rect.top += t * dy
+            elif side == 'left':
+                self.rect.right = paddle.rect.left - 1
+                self.rect.top += t * dy
+            elif side == 'bottom':
+                self.rect.top = paddle.rect.bottom
+                # a paddle that moved onto the ball (t == 0) may have
+                # caught it already heading away; bouncing it back then
+                # would only send it into the paddle again
+                if dy < 0:
+                    self.vector = self.vector.reflect(vertically=True)
+            else:
+                self.rect.bottom = paddle.rect.top
+                if dy > 0:
+                    self.vector = self.vector.reflect(vertically=True)
             diff_y = paddle.rect.center.y - ball_y
             sauce = round((diff_y / paddle.rect.height) * SAUCE_MULTIPLIER)
-            self.vector.magnitude = min(
-                self.vector.magnitude + BALL_SPEED_INCR,
-                BALL_MAX_SPEED)
-            self.sauce = min(SAUCE_MAX, max(SAUCE_MIN, sauce * going_up))
+            sauce = min(SAUCE_MAX, max(SAUCE_MIN, sauce * going_up))
+            self.vector = Vector(
+                self.vector.angle,
+                min(self.vector.magnitude + BALL_SPEED_INCR, BALL_MAX_SPEED))
+            # put the spin on right away; the ball used to sit still for
+            # a frame while update applied it
+            if sauce:
+                self.vector = self.apply_sauce(self.vector, sauce)
+            return True
+        return False
 
     def apply_sauce(self, vector, sauce):
         angle = vector.angle
@@ -188,21 +257,21 @@ class Ball(object):
         mellow_sauce = min(BALL_MAX_ANGLE - abs_from_x_axis,
                            max(direction * sauce,
                                BALL_MIN_ANGLE - abs_from_x_axis))
-        return Vector(vector.angle + mellow_sauce, vector.magnitude)
+        # keep the ball on whole degrees, which is what the trig and
+        # reflection lookup tables cover
+        return Vector(round(vector.angle + mellow_sauce), vector.magnitude)
 
     def update(self):
-        if self.sauce != 0:
-            self.vector = self.apply_sauce(self.vector, self.sauce)
-            self.sauce = 0
-        else:
-            self.rect.move(self.vector)
+        self.rect.move(self.vector)
 
     def draw(self, surface):
-        self.rect.draw(surface)
+        return self.rect.draw(surface)
 
 
 class Paddle(object):
 
+    __slots__ = ('rect', 'vector', 'moved')
+
     def __init__(self, left, top):
         self.rect = Rect(left, top, PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_COLOR)
         self.vector = Vector(90, 0)
@@ -230,7 +299,7 @@ class Paddle(object):
 
     def recenter(self):
         self.moved = True
-        d_center = self.rect.center.y - (SCREEN_HEIGHT // 2)
+        d_center = self.rect.center.y - SCREEN_CENTER_Y
         prev_vector = self.vector
         direction = PADDLE_DOWN_DIR if d_center < 0 else PADDLE_UP_DIR
         turned_around = (
@@ -255,6 +324,9 @@ class Paddle(object):
 
     def update(self):
         if not self.moved:
+            if not self.vector.magnitude:
+                # at rest: nothing to slow down and nowhere to go
+                return
             speed = self.decelerate(self.vector.magnitude)
             self.vector = Vector(self.vector.angle, speed)
         self.moved = False
@@ -265,14 +337,18 @@ class Paddle(object):
             self.rect.bottom = SCREEN_HEIGHT
 
     def draw(self, surface):
-        self.rect.draw(surface)
+        return self.rect.draw(surface)
 
 
 class MercilessAutomaton:
 
+    __slots__ = ('paddle', 'is_human', 'debug', 'prediction',
+                 'sweet_spot_radius')
+
     def __init__(self, paddle):
         self.paddle = paddle
         self.is_human = False
+        self.debug = False
         self.prediction = Path()
         self.sweet_spot_radius = self.paddle.rect.height // 2
 
@@ -288,47 +364,47 @@ class MercilessAutomaton:
         because the bounce is calculated from the edges
         """
         x, y = start
-        diff_x = intercept_x - x
         angle = vector.angle
-        magnitude = diff_x / math.cos(math.radians(angle))
-        projected = Vector(angle, magnitude)
-        proj_y = y + projected.cartesian.y
+        if angle == int(angle):
+            slope = TANGENTS[int(angle)]
+        else:
+            slope = math.tan(math.radians(angle))
+        # bouncing off the top and bottom of the screen is the same as
+        # flying straight through a stack of mirrored copies of it, so
+        # project as if there were no walls (pygame's y-axis points
+        # down, hence subtracting the rise) and fold the result back
+        proj_y = y - (intercept_x - x) * slope
+        bounces = 0
+        if not 0 <= proj_y <= SCREEN_HEIGHT:
+            bounces, proj_y = divmod(proj_y, SCREEN_HEIGHT)
+            bounces = abs(int(bounces))
+            if bounces > max_reflections:
+                return None
+            if bounces % 2:
+                proj_y = SCREEN_HEIGHT - proj_y
         intercept = Point(intercept_x, proj_y)
-        self.prediction.add(start)
+        if self.debug:
+            self.trace_prediction(start, slope, bounces, intercept)
+        return intercept
 
-        if 0 <= proj_y <= SCREEN_HEIGHT:
-            self.prediction.add(intercept)
-            return intercept
-        elif max_reflections == 0:
-            return None
-
-        if proj_y < 0:
-            next_y = 0
+    def trace_prediction(self, start, slope, bounces, intercept):
+        """
+        Record the predicted path of the ball, bounces included
+        """
+        x, y = start
+        self.prediction.add(start)
+        # the kth mirrored wall sits at y = k * SCREEN_HEIGHT. Heading
+        # down we cross walls 1, 2, 3...; heading up 0, -1, -2...
+        if slope < 0:
+            walls = range(1, bounces + 1)
         else:
-            next_y = SCREEN_HEIGHT
-
-        # if a calculated trajectory doesn't intercept our paddle's
-        # movement axis on-screen, we calculate the approximate
-        # intercept between the vector and the top/bottom edge of the
-        # screen, reflect the vector vertically and then see if that
-        # gets us within spitting distance our paddle's movement axis.
-        #
-        # kind of wonky looking math. breaking it down:
-        #
-        # 90 - (angle % 180): get angle of vector compared to y-axis
-        # abs: only interested in dist, not direction
-        # Now our angle is that between the vector and the y-axis; our
-        # new_diff_y is the length of the side adjacent to that angle; we
-        # calc TAN to find the length of the opposite side which
-        # is the x-value at which the vector leaves the screen.
-        new_diff_y = abs(next_y - y)
-        new_diff_x = abs(
-            math.tan(math.radians(90 - (angle % 180))) * new_diff_y)
-
-        new_start = Point(x + new_diff_x, next_y)
-        new_vector = vector.reflect(vertically=True)
-        return self.predict_intercept(new_start, new_vector, intercept_x,
-                                      max_reflections-1)
+            walls = range(0, -bounces, -1)
+        for wall in walls:
+            wall_y = wall * SCREEN_HEIGHT
+            self.prediction.add(Point(
+                x + (y - wall_y) / slope,
+                SCREEN_HEIGHT * (wall % 2)))
+        self.prediction.add(intercept)
 
     # TODO: don't assume we are on the right side
     def play(self, ball):
@@ -348,18 +424,14 @@ class MercilessAutomaton:
         is_in_play = (its_coming_right_for_us and
                       ball.rect.left <= self.paddle.rect.left)
         if is_in_play:
-            ball_location = Point(*ball.rect.center)
             intercept = self.predict_intercept(
-                ball_location, ball.vector, self.paddle.rect.left)
-            sweet_spot = Sides(
-                top=self.paddle.rect.center.y - self.sweet_spot_radius,
-                bottom=self.paddle.rect.center.y + self.sweet_spot_radius,
-                left=None,
-                right=None,
-            )
-            if intercept and intercept.y < sweet_spot.top:
+                ball.rect.center, ball.vector, self.paddle.rect.left)
+            paddle_y = self.paddle.rect.center.y
+            sweet_top = paddle_y - self.sweet_spot_radius
+            sweet_bottom = paddle_y + self.sweet_spot_radius
+            if intercept and intercept.y < sweet_top:
                 self.paddle.up()
-            if intercept and intercept.y > sweet_spot.bottom:
+            if intercept and intercept.y > sweet_bottom:
                 self.paddle.down()
         else:
             self.paddle.recenter()
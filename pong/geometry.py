@@ -18,11 +18,78 @@ Point = namedtuple('Point', ['x', 'y'])
 Line = namedtuple('Line', ['slope', 'intercept'])
 
 
+def _build_trig_table(func, exact):
+    '''
+    Tabulate func for every whole degree in [0, 360)
+
+    exact maps cardinal angles to their true values so that we don't
+    pick up float drift (e.g. cos(90) == 6e-17) along the axes.
+    '''
+    return tuple(
+        exact[angle] if angle in exact else func(math.radians(angle))
+        for angle in range(360)
+    )
+
+
+# Ye olde lookup tables. Game angles are whole degrees nearly always
+_COS = _build_trig_table(math.cos, {0: 1.0, 90: 0.0, 180: -1.0, 270: 0.0})
+_SIN = _build_trig_table(math.sin, {0: 0.0, 90: 1.0, 180: 0.0, 270: -1.0})
+
+
+def _reflect_angle(angle, horizontally, vertically):
+    normed_angle = angle % 360
+    if horizontally:
+        normed_angle = (360 - (normed_angle - 180)) % 360
+    if vertically:
+        normed_angle = 360 - normed_angle
+    return normed_angle % 360
+
+
+# Reflected whole-degree angles, indexed by [2 * horizontally + vertically]
+_REFLECTIONS = tuple(
+    tuple(_reflect_angle(angle, horizontally, vertically)
+          for angle in range(360))
+    for horizontally in (False, True)
+    for vertically in (False, True)
+)
+
+
+# Filled surfaces for Rect.draw, keyed by (width, height, color). Both
+# paddles look alike, so they can share one
+_SURFACES = {}
+
+
+def _slab(start, delta, low, high):
+    '''
+    Get the (entry, exit) times of a point moving along one axis
+    through the interval [low, high], as fractions of delta
+    '''
+    if delta == 0:
+        if low <= start <= high:
+            return -math.inf, math.inf
+        return math.inf, -math.inf
+    low_t = (low - start) / delta
+    high_t = (high - start) / delta
+    if low_t > high_t:
+        return high_t, low_t
+    return low_t, high_t
+
+
+def _pixel(value):
+    '''
+    Round value to a whole pixel the way pygame.Rect does: halves go
+    away from zero (unlike round(), which sends them to even)
+    '''
+    return int(value + 0.5) if value >= 0 else int(value - 0.5)
+
+
 class Segment(object):
     '''
     Construct a line segment from two cartesian points
     '''
 
+    __slots__ = ('start', 'end')
+
     def __init__(self, start, end):
         self.start = Point(*start)
         self.end = Point(*end)
@@ -52,39 +119,36 @@ class Segment(object):
         return [f(self.start.y, self.end.y) for f in (min, max)]
 
     def in_domain(self, x):
-        domain = self.domain
-        return domain[0] <= x <= domain[1]
+        start, end = self.start.x, self.end.x
+        return start <= x <= end or end <= x <= start
 
     def in_range(self, y):
-        range = self.range
-        return range[0] <= y <= range[1]
+        start, end = self.start.y, self.end.y
+        return start <= y <= end or end <= y <= start
 
     def intersection(self, other):
         '''
         Get the intersection of two line segments or None
+
+        Solves start + t * (end - start) = other.start + u * (other.end -
+        other.start); the segments cross when both t and u are in [0, 1].
+        Unlike going through our lines' slopes, vertical segments need
+        no special casing
         '''
-        our_line = self.line
-        their_line = other.line
-        if our_line.slope == their_line.slope:
+        x1, y1 = self.start
+        x2, y2 = self.end
+        x3, y3 = other.start
+        x4, y4 = other.end
+        dx1, dy1 = x2 - x1, y2 - y1
+        dx2, dy2 = x4 - x3, y4 - y3
+        denominator = dx1 * dy2 - dy1 * dx2
+        if denominator == 0:
             # we are parallel
             return None
-        if our_line.slope is None:
-            # we are vertical
-            x = self.start.x
-            y = their_line.slope * x + their_line.intercept
-        elif their_line.slope is None:
-            # they are vertical
-            x = other.start.x
-            y = our_line.slope * x + our_line.intercept
-        else:
-            x = (
-                (their_line.intercept - our_line.intercept) /
-                (our_line.slope - their_line.slope)
-            )
-            y = our_line.slope * x + our_line.intercept
-
-        if all(seg.in_domain(x) and seg.in_range(y) for seg in (self, other)):
-            return Point(x, y)
+        t = ((x3 - x1) * dy2 - (y3 - y1) * dx2) / denominator
+        u = ((x3 - x1) * dy1 - (y3 - y1) * dx1) / denominator
+        if 0 <= t <= 1 and 0 <= u <= 1:
+            return Point(x1 + t * dx1, y1 + t * dy1)
         return None
 
 
@@ -93,12 +157,15 @@ class Rect(object):
     Towards modelling our own rects independent of screen pixels
     '''
 
+    __slots__ = ('left', 'top', 'height', 'width', 'color', '_image')
+
     def __init__(self, left, top, width, height, color=None):
         self.left = left
         self.top = top
         self.height = height
         self.width = width
         self.color = color
+        self._image = None
 
     def __repr__(self):
         return '<Rect (x: {}, y: {}, w: {}, h: {})>'.format(
@@ -132,23 +199,28 @@ class Rect(object):
 
     @property
     def corners(self):
+        left, top, right, bottom = self._edges()
         return Corners(
-            topleft=Point(self.left, self.top),
-            topright=Point(self.right, self.top),
-            bottomright=Point(self.right, self.bottom),
-            bottomleft=Point(self.left, self.bottom),
+            topleft=Point(left, top),
+            topright=Point(right, top),
+            bottomright=Point(right, bottom),
+            bottomleft=Point(left, bottom),
         )
 
     @property
     def segments(self):
-        corners = self.corners
+        left, top, right, bottom = self._edges()
         return Sides(
-            top=Segment(corners.topleft, corners.topright),
-            right=Segment(corners.topright, corners.bottomright),
-            bottom=Segment(corners.bottomleft, corners.bottomright),
-            left=Segment(corners.topleft, corners.bottomleft)
+            top=Segment((left, top), (right, top)),
+            right=Segment((right, top), (right, bottom)),
+            bottom=Segment((left, bottom), (right, bottom)),
+            left=Segment((left, top), (left, bottom))
         )
 
+    def _edges(self):
+        left, top = self.left, self.top
+        return left, top, left + self.width, top + self.height
+
     def contains(self, other):
         return (
             self.left < other.left and
@@ -167,8 +239,8 @@ class Rect(object):
         return has_collisions
 
     def get_uncontained_edges(self, containing_rect):
-        if containing_rect.contains(self):
-            return Sides(False, False, False, False)
+        # no need to check containing_rect.contains(self) first: when
+        # we are contained these comparisons all come out False anyway
         return Sides(
             top=(self.top <= containing_rect.top),
             right=(self.right >= containing_rect.right),
@@ -185,23 +257,86 @@ class Rect(object):
         bottom = other.top <= self.bottom <= other.bottom
         return Sides(top=top, right=right, bottom=bottom, left=left)
 
+    def sweep(self, other, dx, dy):
+        '''
+        Find where we first run into other while moving by (dx, dy)
+
+        Returns a tuple (t, side) where t in [0, 1] is how much of the
+        move we make before touching other and side is the name of the
+        side of other we touch ('top', 'right', 'bottom' or 'left'). If
+        we miss, returns None. If we are overlapping other to begin with
+        (say it moved onto us) t is 0 and side is the one we are least
+        far past, i.e. the way out.
+
+        Growing other by our size turns this into a ray (our top left
+        corner) against a box, which is two interval tests
+        '''
+        left, top = other.left, other.top
+        x_entry, x_exit = _slab(
+            self.left, dx, left - self.width, left + other.width)
+        y_entry, y_exit = _slab(
+            self.top, dy, top - self.height, top + other.height)
+        entry = max(x_entry, y_entry)
+        if entry > min(x_exit, y_exit) or entry > 1:
+            return None
+        if entry < 0:
+            if min(x_exit, y_exit) <= 0:
+                # we've already left other behind
+                return None
+            return 0, self._exit_side(other)
+        if x_entry >= y_entry:
+            side = 'left' if dx > 0 else 'right'
+        else:
+            side = 'top' if dy > 0 else 'bottom'
+        return entry, side
+
+    def _exit_side(self, other):
+        '''
+        Name the side of other we overlap it by the least
+        '''
+        depths = (
+            (self.top + self.height - other.top, 'top'),
+            (other.left + other.width - self.left, 'right'),
+            (other.top + other.height - self.top, 'bottom'),
+            (self.left + self.width - other.left, 'left'),
+        )
+        return min(depths)[1]
+
     def move(self, vector):
         x, y = vector.cartesian
         self.left += x
         self.top += y
 
     def draw(self, surface):
-        image = pygame.Surface((self.width, self.height))
-        image.fill(self.color)
-        image_rect = image.get_rect(top=self.top, left=self.left)
-        surface.blit(image, image_rect)
+        if self._image is None:
+            self._image = self._render()
+        # blit to a plain position rather than allocating a pygame
+        # Rect for it. blit would truncate, so round as get_rect() did
+        return surface.blit(self._image, (_pixel(self.left), _pixel(self.top)))
+
+    def _render(self):
+        key = (self.width, self.height, self.color)
+        image = _SURFACES.get(key)
+        if image is None:
+            image = pygame.Surface((self.width, self.height))
+            image.fill(self.color)
+            if pygame.display.get_surface() is not None:
+                # match the display's pixel format up front so blitting
+                # doesn't convert every pixel on every frame. Only share
+                # converted surfaces; they're what we want to keep
+                image = image.convert()
+                _SURFACES[key] = image
+        return image
 
 
 class Vector(object):
 
+    __slots__ = ('angle', 'magnitude', '_cartesian')
+
     def __init__(self, angle, magnitude):
         self.angle = angle % 360
         self.magnitude = magnitude
+        self._cartesian = None
 
     def __repr__(self):
         return '<Vector (a: {}, m: {} x: {}, y: {})>'.format(
@@ -211,39 +346,52 @@ class Vector(object):
 
     @classmethod
     def from_cartesian(cls, x, y):
-        magnitude = math.sqrt(x**2 + y**2)
-        y = -y
-        if x == 0:
-            angle = 90 if y >= 0 else 270
-        else:
-            angle = math.degrees(math.atan(y / x))
-            if y < 0 or x < 0:
-                angle += 180
-                if x > 0:
-                    angle += 180
-            angle %= 360
+        magnitude = math.hypot(x, y)
+        if not magnitude:
+            # atan2 would call this 0; we've always pointed a zero vector
+            # straight up, which is what Paddle expects from recenter
+            return cls(90, magnitude)
+        # pygame's y-axis points down. Tiny negative angles can come out
+        # of the % as exactly 360.0; cls's own % 360 then folds that to 0
+        angle = math.degrees(math.atan2(-y, x)) % 360
         return cls(angle, magnitude)
 
     @property
     def cartesian(self):
+        # Vectors are treated as immutable (reflect and friends hand
+        # back new ones) so the x/y pair only ever needs computing once
+        if self._cartesian is None:
+            self._cartesian = self._to_cartesian()
+        return self._cartesian
+
+    def _to_cartesian(self):
         magnitude = self.magnitude
         angle = self.angle
-        x = magnitude * math.cos(math.radians(angle))
-        y = -magnitude * math.sin(math.radians(angle))
-        if angle == 0:
-            x = magnitude
-        if angle == 90:
-            y = -magnitude
-        if angle == 180:
-            x = -magnitude
-        if angle == 270:
-            y = magnitude
-        return Point(x, y)
+        if angle == int(angle):
+            # whole degrees (which includes the cardinal angles) come
+            # straight out of the lookup tables
+            angle = int(angle)
+            return Point(magnitude * _COS[angle], -magnitude * _SIN[angle])
+        radians = math.radians(angle)
+        return Point(magnitude * math.cos(radians),
+                     -magnitude * math.sin(radians))
 
     def reflect(self, horizontally=False, vertically=False):
-        normed_angle = self.angle % 360
-        if horizontally:
-            normed_angle = (360 - (normed_angle - 180)) % 360
-        if vertically:
-            normed_angle = 360 - normed_angle
-        return self.__class__(normed_angle, self.magnitude)
+        if not (horizontally or vertically):
+            # we're immutable, so there's no need to make a copy
+            return self
+        angle = self.angle
+        if angle == int(angle):
+            reflections = _REFLECTIONS[2 * bool(horizontally) +
+                                       bool(vertically)]
+            angle = reflections[int(angle)]
+        else:
+            angle = _reflect_angle(angle, horizontally, vertically)
+        reflected = self.__class__(angle, self.magnitude)
+        if self._cartesian is not None:
+            # mirroring over an axis just negates a component, which is
+            # cheaper than (and exactly as long as) going back to trig
+            x, y = self._cartesian
+            reflected._cartesian = Point(-x if horizontally else x,
+                                         -y if vertically else y)
+        return reflected
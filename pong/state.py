@@ -5,12 +5,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import sys
-from abc import ABCMeta
-from abc import abstractmethod
 from types import SimpleNamespace
 
 import pygame
-import six
 from pygame import locals as consts
 
 from .game import BACKGROUND_COLOR
@@ -18,14 +15,15 @@ from .game import FRAMES_PER_SECOND
 from .game import PADDLE_WIDTH
 from .game import PLAYER1_KEY_MAP
 # from .game import PLAYER2_KEY_MAP
+from .game import SCREEN_CENTER_X
 from .game import SCREEN_HEIGHT
+from .game import SCREEN_RECT
 from .game import SCREEN_WIDTH
 from .game import Ball
 from .game import Color
 from .game import MercilessAutomaton
 from .game import Paddle
 from .game import Player
-from .geometry import Rect
 
 
 DEBUG = False  # fixme
@@ -34,21 +32,23 @@ DEBUG = False  # fixme
 FONT = pygame.font.get_default_font()
 FONT_COLOR = Color(r=127, g=216, b=127)
 PAUSE_FONT_SIZE = 72
+PAUSE_TEXT_TOP = 200
 
 
-class State(six.with_metaclass(ABCMeta, object)):
+class State(object):
 
-    @abstractmethod
     def run(self, game):
         raise NotImplementedError
 
-    def is_quit_event(self, e):
+    @staticmethod
+    def is_quit_event(e):
         return (
             e.type == consts.QUIT or
             (e.type == consts.KEYDOWN and e.key == consts.K_ESCAPE)
         )
 
-    def is_pause_event(self, e):
+    @staticmethod
+    def is_pause_event(e):
         return e.type == consts.KEYDOWN and e.key == consts.K_p
 
 
@@ -61,79 +61,109 @@ class Menu(State):
 class Playing(State):
 
     def run(self, game):
-        screen_rect = Rect(0, 0, game.screen_width, game.screen_height)
+        screen_rect = game.screen_rect
         background = game.background
         screen = game.screen
         fps = game.fps
-        clock = game.clock
+        tick = game.clock.tick
+        # debug is fixed for the whole game, so read it just the once
+        debug = game.debug
         screen.blit(game.background, (0, 0))
+        pygame.display.flip()
         players = game.players
         ball = game.ball
-        paddles = [p.paddle for p in players]
-        sprites = paddles + [ball]
-        predictions = [p.prediction for p in players if not p.is_human]
+        # split the players once rather than checking is_human every frame
+        humans = tuple(p for p in players if p.is_human)
+        automata = tuple(p for p in players if not p.is_human)
+        paddles = tuple(p.paddle for p in players)
+        sprites = paddles + (ball,)
+        updaters = tuple(sprite.update for sprite in sprites)
+        drawers = tuple(sprite.draw for sprite in sprites)
+        # predicted paths are only drawn when debugging
+        predictions = tuple(p.prediction for p in automata) if debug else ()
+        # screen areas the sprites were drawn over on the last frame
+        drawn = []
+        # resolve the pygame calls made every frame up front
+        get_events = pygame.event.get
+        get_pressed = pygame.key.get_pressed
+        flip = pygame.display.flip
+        update_display = pygame.display.update
+        QUIT, KEYDOWN = consts.QUIT, consts.KEYDOWN
+        K_ESCAPE, K_p, K_d = consts.K_ESCAPE, consts.K_p, consts.K_d
 
         while True:
-            for e in pygame.event.get():
-                if self.is_quit_event(e):
+            # is_quit_event and is_pause_event, inlined
+            for e in get_events():
+                if e.type == QUIT:
                     return None
-                if self.is_pause_event(e):
-                    return game.states.paused
+                if e.type == KEYDOWN:
+                    if e.key == K_ESCAPE:
+                        return None
+                    if e.key == K_p:
+                        return game.states.paused
 
-            keys = pygame.key.get_pressed()
+            keys = get_pressed()
 
-            if game.debug and keys[consts.K_d]:
+            if debug and keys[K_d]:
                 import pdb; pdb.set_trace()  # noqa
 
             ball.handle_screen_edges(screen_rect)
-            for player in players:
-                if player.is_human:
-                    player.dispatch(keys)
-                else:
-                    player.play(ball)
-                ball.handle_paddle_collision(player.paddle)
+            for player in humans:
+                player.dispatch(keys)
+            # collide before the automata look at the ball, so they see
+            # this frame's bounce rather than reacting a frame late
+            ball.handle_paddle_collisions(paddles)
+            for player in automata:
+                player.play(ball)
+
+            if debug:
+                # predicted paths can cover any part of the screen
                 screen.blit(background, (0, 0))
-            for sprite in sprites:
-                sprite.update()
-                sprite.draw(screen)
-
-            if game.debug:
+            else:
+                # otherwise only the sprites moved, so only erase them
+                for rect in drawn:
+                    screen.blit(background, rect, rect)
+            erased = drawn
+            for update in updaters:
+                update()
+            drawn = [draw(screen) for draw in drawers]
+
+            if debug:
                 for prediction in predictions:
                     if len(prediction.points) > 1:
                         prediction.draw(screen)
-
-            pygame.display.flip()
-            clock.tick(fps)
+                flip()
+            else:
+                update_display(erased + drawn)
+            tick(fps)
 
 
 class Paused(State):
 
     def run(self, game):
-        clock = game.clock
-        font = game.pause_font
-        fps = 10  # cough constant cough
-        top = 200  # ditto
-        left = game.screen_width // 2 - font.size("PAUSED")[0] // 2
-        text = font.render("PAUSED", True, game.font_color)
-        text_rect = text.get_rect()
-        text_rect.top = top
-        text_rect.left = left
-        game.screen.blit(text, text_rect)
-        pygame.display.flip()
-        clock.tick(fps)
+        text_rect = game.pause_text_rect
+        game.screen.blit(game.pause_text, text_rect)
+        # nothing else on screen changes while we're paused
+        pygame.display.update(text_rect)
+        # there's nothing to animate, so sleep until something happens
+        # rather than polling
         while True:
-            for e in pygame.event.get():
-                if self.is_quit_event(e):
-                    return None
-                if self.is_pause_event(e):
-                    return game.states.playing
-            clock.tick(fps)
+            e = pygame.event.wait()
+            if self.is_quit_event(e):
+                return None
+            if self.is_pause_event(e):
+                return game.states.playing
 
 
 class Game(object):
 
     def __init__(self):
         pygame.init()
+        # QUIT and KEYDOWN are all we ever act on, so have SDL drop
+        # everything else (mouse motion, key ups...) before it's queued.
+        # Held keys are still read with pygame.key.get_pressed()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([consts.QUIT, consts.KEYDOWN])
         pygame.display.set_caption('pong')
         pygame.mouse.set_visible(False)
 
@@ -144,10 +174,13 @@ class Game(object):
 
         self.screen_width = SCREEN_WIDTH
         self.screen_height = SCREEN_HEIGHT
+        self.screen_rect = SCREEN_RECT
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.fps = FRAMES_PER_SECOND
         self.clock = pygame.time.Clock()
-        self.background = pygame.Surface(self.screen.get_size())
+        # in the display's pixel format, so the per-frame erase blits
+        # are straight copies
+        self.background = pygame.Surface(self.screen.get_size()).convert()
         self.background.fill(BACKGROUND_COLOR)
         self.screen.blit(self.background, (0, 0))
 
@@ -161,9 +194,17 @@ class Game(object):
 
         self.font_color = FONT_COLOR
         self.pause_font = pygame.font.Font(FONT, PAUSE_FONT_SIZE)
+        # the pause screen never changes, so render it just the once
+        self.pause_text = self.pause_font.render(
+            'PAUSED', True, self.font_color).convert_alpha()
+        self.pause_text_rect = self.pause_text.get_rect(
+            top=PAUSE_TEXT_TOP, centerx=SCREEN_CENTER_X)
 
     def run(self, debug=False):
         self.debug = debug
+        for player in self.players:
+            if not player.is_human:
+                player.debug = debug
         state = self.states.playing.run(self)
         while state is not None:
             state = state.run(self)
@@ -0,0 +1,98 @@
+'''
+Super incomplete tests for pong.game
+'''
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import math
+import unittest
+
+from pong.game import SCREEN_HEIGHT
+from pong.game import MercilessAutomaton
+from pong.game import Paddle
+from pong.geometry import Point
+from pong.geometry import Vector
+
+
+def stepped_intercept(start, vector, intercept_x, max_reflections=5):
+    '''
+    Predict the intercept the long way: fly to the next wall, reflect,
+    repeat. This is how predict_intercept used to work
+    '''
+    x, y = start
+    angle = vector.angle
+    while True:
+        proj_y = y - (intercept_x - x) * math.tan(math.radians(angle))
+        if 0 <= proj_y <= SCREEN_HEIGHT:
+            return Point(intercept_x, proj_y)
+        elif max_reflections == 0:
+            return None
+        next_y = 0 if proj_y < 0 else SCREEN_HEIGHT
+        new_diff_x = abs(
+            math.tan(math.radians(90 - (angle % 180))) * abs(next_y - y))
+        x, y = x + new_diff_x, next_y
+        angle = (360 - angle) % 360
+        max_reflections -= 1
+
+
+class PredictInterceptTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.ai = MercilessAutomaton(Paddle(1490, 50))
+        self.intercept_x = 1490
+        self.cases = {
+            'straight': (Point(800, 500), Vector(20, 20)),
+            'one bounce': (Point(800, 500), Vector(50, 20)),
+            'several bounces': (Point(100, 500), Vector(70, 20)),
+            'down several bounces': (Point(100, 300), Vector(290, 20)),
+            'in the wall band': (Point(1200, 3), Vector(60, 20)),
+            'on the wall': (Point(1200, SCREEN_HEIGHT), Vector(300, 20)),
+            'horizontal': (Point(100, 400), Vector(0, 20)),
+            'fractional angle': (Point(300, 700), Vector(33.3, 20)),
+        }
+
+    def assertSameIntercept(self, actual, expected, msg):
+        if expected is None:
+            self.assertIsNone(actual, msg)
+        else:
+            self.assertIsNotNone(actual, msg)
+            self.assertAlmostEqual(actual.x, expected.x, msg=msg)
+            self.assertAlmostEqual(actual.y, expected.y, msg=msg)
+
+    def test_matches_stepped(self):
+        for name, (start, vector) in self.cases.items():
+            self.assertSameIntercept(
+                self.ai.predict_intercept(start, vector, self.intercept_x),
+                stepped_intercept(start, vector, self.intercept_x),
+                name)
+
+    def test_too_many_bounces(self):
+        start, vector = Point(100, 500), Vector(85, 20)
+        self.assertIsNone(stepped_intercept(start, vector, 1490))
+        self.assertIsNone(self.ai.predict_intercept(start, vector, 1490))
+        for max_reflections in range(6):
+            self.assertSameIntercept(
+                self.ai.predict_intercept(
+                    Point(100, 500), Vector(70, 20), 1490, max_reflections),
+                stepped_intercept(
+                    Point(100, 500), Vector(70, 20), 1490, max_reflections),
+                max_reflections)
+
+    def test_trace_prediction(self):
+        self.ai.debug = True
+        for name, (start, vector) in self.cases.items():
+            self.ai.prediction.clear()
+            intercept = self.ai.predict_intercept(
+                start, vector, self.intercept_x)
+            self.assertSameIntercept(
+                intercept,
+                stepped_intercept(start, vector, self.intercept_x),
+                name)
+            points = self.ai.prediction.points
+            self.assertEqual(points[0], start, name)
+            self.assertEqual(points[-1], intercept, name)
+            # every point in between is a bounce off the top or bottom
+            for point in points[1:-1]:
+                self.assertIn(point.y, (0, SCREEN_HEIGHT), name)
+                self.assertTrue(start.x <= point.x <= intercept.x, name)
@@ -8,6 +8,8 @@ from __future__ import (absolute_import, division, print_function,
 import math
 import unittest
 
+import pygame
+
 from pong.geometry import Point
 from pong.geometry import Rect
 from pong.geometry import Segment
@@ -38,10 +40,63 @@ class RectTestCase(unittest.TestCase):
         self.assertEqual(self.rect1.center.x, 45)
         self.assertEqual(self.rect1.center.y, 60)
 
+    def test_corners_and_segments(self):
+        corners = self.rect1.corners
+        self.assertEqual(corners.topleft, Point(15, 20))
+        self.assertEqual(corners.bottomright, Point(75, 100))
+        segments = self.rect1.segments
+        self.assertEqual(segments.top.start, corners.topleft)
+        self.assertEqual(segments.top.end, corners.topright)
+        self.assertEqual(segments.right.end, corners.bottomright)
+        self.assertEqual(segments.bottom.start, corners.bottomleft)
+        self.assertEqual(segments.left.end, corners.bottomleft)
+
     def test_contains(self):
         self.assertTrue(self.rect1.contains(self.rect3))
         self.assertFalse(self.rect1.contains(self.rect2))
 
+    def test_sweep(self):
+        ball = Rect(0, 0, 10, 10)
+        paddle = Rect(30, 0, 10, 40)
+        self.assertEqual(ball.sweep(paddle, 40, 0), (0.5, 'left'))
+        self.assertEqual(ball.sweep(paddle, 40, 20), (0.5, 'left'))
+        self.assertEqual(ball.sweep(paddle, 10, 0), None)
+        self.assertEqual(ball.sweep(paddle, -40, 0), None)
+        self.assertEqual(ball.sweep(paddle, 40, 100), None)
+        ball = Rect(50, 10, 10, 10)
+        self.assertEqual(ball.sweep(paddle, -20, 0), (0.5, 'right'))
+        ball = Rect(30, -20, 10, 10)
+        self.assertEqual(ball.sweep(paddle, 0, 20), (0.5, 'top'))
+        self.assertEqual(ball.sweep(paddle, 0, -20), None)
+        ball = Rect(30, 50, 10, 10)
+        self.assertEqual(ball.sweep(paddle, 0, -20), (0.5, 'bottom'))
+        # already overlapping: no time passes and we're told the side
+        # we're least far past, whichever way we're going
+        ball = Rect(32, 10, 10, 10)
+        self.assertEqual(ball.sweep(paddle, 40, 0), (0, 'right'))
+        self.assertEqual(ball.sweep(paddle, 0, 0), (0, 'right'))
+        ball = Rect(25, 10, 10, 10)
+        self.assertEqual(ball.sweep(paddle, -40, 0), (0, 'left'))
+        # e.g. a paddle that moved up onto a ball passing its top
+        ball = Rect(30, -7, 10, 10)
+        self.assertEqual(ball.sweep(paddle, 40, 20), (0, 'top'))
+
+    def test_draw(self):
+        surface = pygame.Surface((100, 100))
+        # halves round away from zero, like pygame.Rect
+        rect = Rect(2.5, 3.5, 10, 10, (255, 255, 255))
+        self.assertEqual(rect.draw(surface), pygame.Rect(3, 4, 10, 10))
+        rect = Rect(6.5, 4.4, 10, 10, (255, 255, 255))
+        self.assertEqual(rect.draw(surface), pygame.Rect(7, 4, 10, 10))
+
+    def test_get_uncontained_edges(self):
+        self.assertEqual(
+            tuple(self.rect3.get_uncontained_edges(self.rect1)),
+            (False, False, False, False))
+        self.assertEqual(
+            tuple(self.rect2.get_uncontained_edges(self.rect1)),
+            (True, False, False, True))
+
 
 class VectorTestCase(unittest.TestCase):
 
@@ -67,6 +122,7 @@ class VectorTestCase(unittest.TestCase):
         for polar, cart in zip(self.vectors, self.cart_vectors):
             self.assertAlmostEqual(polar.angle, cart.angle)
             self.assertAlmostEqual(polar.magnitude, cart.magnitude)
+        self.assertEqual(Vector.from_cartesian(0, 0).angle, 90)
 
     def test_to_cartesian(self):
         for polar, point in zip(self.vectors, self.points):
@@ -79,6 +135,16 @@ class VectorTestCase(unittest.TestCase):
             self.assertAlmostEqual(as_cart.x, point.x)
             self.assertAlmostEqual(as_cart.y, point.y)
 
+    def test_cardinal_cartesian(self):
+        actual_expected = [
+            (Vector(0, 5).cartesian, Point(5, 0)),
+            (Vector(90, 5).cartesian, Point(0, -5)),
+            (Vector(180, 5).cartesian, Point(-5, 0)),
+            (Vector(270, 5).cartesian, Point(0, 5)),
+        ]
+        for actual, expected in actual_expected:
+            self.assertEqual(actual, expected)
+
     def test_reflect(self):
         for vector in self.vectors:
             vert = vector.reflect(vertically=True)
@@ -93,6 +159,28 @@ class VectorTestCase(unittest.TestCase):
             self.assertAlmostEqual(combo1.angle, combo2.angle)
             self.assertAlmostEqual(combo1.angle, both.angle)
 
+    def test_reflect_cartesian(self):
+        for vector in self.vectors:
+            x, y = vector.cartesian
+            both = vector.reflect(horizontally=True, vertically=True)
+            self.assertEqual(both.cartesian, Point(-x, -y))
+            fresh = Vector(both.angle, both.magnitude).cartesian
+            self.assertAlmostEqual(both.cartesian.x, fresh.x)
+            self.assertAlmostEqual(both.cartesian.y, fresh.y)
+
+    def test_reflect_lookup(self):
+        flag_combos = [(False, False), (True, False),
+                       (False, True), (True, True)]
+        for angle in range(360):
+            # whole degrees are looked up, fractional ones are computed
+            whole = Vector(angle, 1)
+            nudged = Vector(angle + 1e-9, 1)
+            for flags in flag_combos:
+                expected = nudged.reflect(*flags).cartesian
+                actual = whole.reflect(*flags).cartesian
+                self.assertAlmostEqual(actual.x, expected.x)
+                self.assertAlmostEqual(actual.y, expected.y)
+
 
 class SegmentTestCase(unittest.TestCase):
 
@@ -101,6 +189,9 @@ class SegmentTestCase(unittest.TestCase):
         self.s2 = Segment(Point(0, 1), Point(1, 0))
         self.s3 = Segment(Point(0, -1), Point(1, 0))
         self.s4 = Segment(Point(1, 1), Point(2, 2))
+        # s5 and s6 are vertical
+        self.s5 = Segment(Point(0.5, -1), Point(0.5, 2))
+        self.s6 = Segment(Point(1, -1), Point(1, 2))
 
     def test_line(self):
         s1_line = self.s1.line
@@ -113,6 +204,14 @@ class SegmentTestCase(unittest.TestCase):
         self.assertEqual(s3_line.slope, 1)
         self.assertEqual(s3_line.intercept, -1)
 
+    def test_domain_and_range(self):
+        self.assertEqual(self.s2.domain, [0, 1])
+        self.assertEqual(self.s2.range, [0, 1])
+        self.assertTrue(self.s2.in_domain(0.5))
+        self.assertTrue(self.s2.in_range(0))
+        self.assertFalse(self.s2.in_domain(1.5))
+        self.assertFalse(self.s2.in_range(-0.5))
+
     def test_intersection(self):
         actual_expected = [
             (self.s1.intersection(self.s2), Point(0.5, 0.5)),
@@ -127,6 +226,10 @@ class SegmentTestCase(unittest.TestCase):
             (self.s4.intersection(self.s2), None),
             (self.s3.intersection(self.s4), None),
             (self.s4.intersection(self.s3), None),
+            (self.s1.intersection(self.s5), Point(0.5, 0.5)),
+            (self.s5.intersection(self.s2), Point(0.5, 0.5)),
+            (self.s4.intersection(self.s6), Point(1, 1)),
+            (self.s5.intersection(self.s6), None),
         ]
         for actual, expected in actual_expected:
             if expected is None: